@@ -1,8 +1,16 @@
+import ast
 import asyncio
+import hashlib
+import json
+import logging
+import queue
 import re
+import httpx
+from collections import OrderedDict, deque
+from logging.handlers import QueueHandler, QueueListener
 from langgraph.graph import StateGraph, START, END
 from dataclasses import dataclass, field
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Deque, Dict, Literal, Optional, Tuple
 from abc import ABC, abstractmethod
 from model import llm
 from langchain_core.prompts import ChatPromptTemplate
@@ -11,16 +19,345 @@ from mcp.client.streamable_http import streamablehttp_client
 from mcp import ClientSession
 from langchain_mcp_adapters.tools import load_mcp_tools
 from langgraph.prebuilt import create_react_agent
+from pydantic import BaseModel, ValidationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+MCP_SERVER_URL = "http://127.0.0.1:8000/mcp"
+MCP_MAX_KEEPALIVE_CONNECTIONS = 5
+PROMPT_CACHE_SIZE = 512
+EXECUTION_CACHE_SIZE = 256
+MAX_MESSAGES = 256
+EXECUTION_TIMEOUT = 45
+TEST_CONCURRENCY = 4
+EXECUTE_TOOL_NAME = "execute_code"
+
+EXECUTOR_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "Execute the code provided by the user using given tools. "
+        "Reply with ONLY a JSON object of the form "
+        '{"status": "success" or "failure", "stdout": "<program output>", "error": "<error details>"} '
+        "and nothing else."
+    ),
+}
 
 
 def get_llm():
     return llm
 
 
-@dataclass
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+    """Route log records through a queue so agents never block on stream writes.
+
+    The returned listener writes records from a background thread and must be
+    stopped by the caller.
+    """
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, handler)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    listener.start()
+    return listener
+
+
+def _mcp_http_client_factory(headers=None, timeout=None, auth=None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout if timeout is not None else httpx.Timeout(30.0),
+        auth=auth,
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=MCP_MAX_KEEPALIVE_CONNECTIONS),
+    )
+
+
+class LRUCache:
+    """Small in-memory least-recently-used cache keyed by strings."""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+    
+    def put(self, key: str, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+DEFINITE_ERRORS = [
+    'traceback (most recent call last)',
+    'syntaxerror:',
+    'nameerror:',
+    'indentationerror:',
+    'typeerror:',
+    'valueerror:',
+    'attributeerror:',
+    'importerror:',
+    'modulenotfounderror:',
+    'keyerror:',
+    'indexerror:',
+    'zerodivisionerror:',
+    'execution failed',
+    'error occurred',
+    'failed to execute',
+    'unable to execute',
+    'internal error',
+    'fail',
+    'error',
+    'exception',
+]
+
+SUCCESS_INDICATORS = [
+    'success',
+    'passed',
+    'executed successfully',
+    'completed successfully',
+    'execution completed',
+    'ran successfully',
+]
+
+REFUSAL_INDICATORS = ['sorry', 'unable', 'cannot']
+
+
+def _compile_any(words: List[str]) -> re.Pattern:
+    return re.compile("|".join(map(re.escape, words)), re.IGNORECASE)
+
+
+_ERROR_RE = _compile_any(DEFINITE_ERRORS)
+_SUCCESS_RE = _compile_any(SUCCESS_INDICATORS)
+_REFUSAL_RE = _compile_any(REFUSAL_INDICATORS)
+
+
+if orjson is not None:
+    def _dumps_sorted(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    
+    _loads = orjson.loads
+else:
+    def _dumps_sorted(obj: Any) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode()
+    
+    _loads = json.loads
+
+
+def _cache_key(**parts: Any) -> str:
+    return hashlib.sha256(_dumps_sorted(parts)).hexdigest()
+
+
+_PATH_DIRS_RE = re.compile(r"(?:[A-Za-z]:)?(?:[\\/][\w.+-]+)+[\\/](?=[\w.+-]+)")
+_SCRATCH_NAME_RE = re.compile(r"\b(?:prog_[0-9a-f]{32}|\.build-\w+|tmp\w{8})\b")
+
+
+def _normalize_error(error: Optional[str]) -> Optional[str]:
+    """Strip per-run file paths from an error so repeated failures compare equal."""
+    if error is None:
+        return None
+    return _SCRATCH_NAME_RE.sub("program", _PATH_DIRS_RE.sub("", error))
+
+
+_CODE_FENCE_RE = re.compile(r"^\s*```([\w+-]*)[ \t]*\n(.*?)\n?```\s*$", re.DOTALL)
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,\d+)? \+\d+(?:,\d+)? @@")
+
+
+def _strip_code_fences(text: str) -> str:
+    match = _CODE_FENCE_RE.match(text)
+    return match.group(2) if match else text
+
+
+# Fence info strings and the executor language they stand for
+_FENCE_LANGUAGES = {
+    "python": "python", "py": "python", "python3": "python",
+    "java": "java",
+    "javascript": "javascript", "js": "javascript", "node": "javascript",
+    "cpp": "cpp", "c++": "cpp", "cc": "cpp", "cxx": "cpp",
+}
+
+# Unfenced code is recognized by unmistakable markers only; Python is checked
+# last since its markers are the weakest.
+_LANGUAGE_MARKERS = [
+    ("cpp", re.compile(r"^\s*#include\s*[<\"]|\bstd::|\bint\s+main\s*\(", re.MULTILINE)),
+    ("java", re.compile(r"\bpublic\s+(?:final\s+)?class\b|\bSystem\.out\.|\bpublic\s+static\s+void\s+main\b")),
+    ("javascript", re.compile(r"\bconsole\.log\s*\(|\brequire\s*\(|^\s*(?:const|let)\s+\w+\s*=", re.MULTILINE)),
+    ("python", re.compile(r"^\s*(?:def|class)\s+\w+.*:\s*$|^\s*(?:from\s+\w+\s+)?import\s+\w+|^\s*print\s*\(", re.MULTILINE)),
+]
+
+
+def _detect_language(text: str) -> Optional[str]:
+    """Return the executor language of generated code, or None if unknown."""
+    match = _CODE_FENCE_RE.match(text)
+    if match and match.group(1):
+        return _FENCE_LANGUAGES.get(match.group(1).lower())
+    code = match.group(2) if match else text
+    for language, marker in _LANGUAGE_MARKERS:
+        if marker.search(code):
+            return language
+    return None
+
+
+def _find_block(lines: List[str], block: List[str], start: int) -> Optional[int]:
+    wanted = [line.rstrip() for line in block]
+    for i in range(start, len(lines) - len(block) + 1):
+        if [line.rstrip() for line in lines[i:i + len(block)]] == wanted:
+            return i
+    return None
+
+
+def _apply_unified_diff(original: str, diff: str) -> Optional[str]:
+    """Apply a unified diff to ``original`` and return the patched text.
+
+    Hunks are located by their context and removed lines rather than by the
+    line numbers in the hunk header, since model-written diffs often get the
+    numbers wrong. Returns None if the diff has no hunks or any hunk does not
+    match.
+    """
+    hunks = []
+    for line in _strip_code_fences(diff.strip()).rstrip().splitlines():
+        header = _HUNK_HEADER_RE.match(line)
+        if header:
+            hunks.append((int(header.group(1)), [], []))
+        elif not hunks:
+            continue
+        elif line.startswith("\\"):
+            continue
+        elif line.startswith("-"):
+            hunks[-1][1].append(line[1:])
+        elif line.startswith("+"):
+            hunks[-1][2].append(line[1:])
+        elif line.startswith(" ") or line == "":
+            hunks[-1][1].append(line[1:])
+            hunks[-1][2].append(line[1:])
+        else:
+            return None
+    if not hunks:
+        return None
+    
+    lines = original.splitlines()
+    patched: List[str] = []
+    pos = 0
+    for old_start, old, new in hunks:
+        if old:
+            start = _find_block(lines, old, pos)
+        else:
+            start = min(max(old_start, pos), len(lines))
+        if start is None:
+            return None
+        patched.extend(lines[pos:start])
+        patched.extend(new)
+        pos = start + len(old)
+    patched.extend(lines[pos:])
+    return "\n".join(patched)
+
+
+class ExecResult(BaseModel):
+    status: Literal["success", "failure"]
+    stdout: str = ""
+    error: str = ""
+
+
+def _format_report(output: str, error: str) -> str:
+    parts = []
+    if output:
+        parts.append(f"Output:\n{output}")
+    if error:
+        parts.append(f"Error:\n{error}")
+    return "\n".join(parts) or "Program produced no output"
+
+
+def _static_check(code: str) -> Optional[str]:
+    """Return a compile error for Python code, or None if it compiles.
+
+    Only call this for code known to be Python; any other language would
+    fail to compile here even when it is valid.
+    """
+    try:
+        compile(code, "<generated>", "exec")
+    except (SyntaxError, ValueError) as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Compare)
+        and isinstance(node.test.left, ast.Name)
+        and node.test.left.id == "__name__"
+    )
+
+
+def _is_test_call(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Call)
+        and isinstance(node.value.func, ast.Name)
+        and node.value.func.id.startswith("test_")
+        and not node.value.args
+        and not node.value.keywords
+    )
+
+
+def _split_tests(code: str) -> tuple[str, List[tuple[str, str]]]:
+    """Split Python code into a shared prelude and independent test snippets.
+
+    The prelude keeps every definition, including all ``test_*`` functions,
+    so tests can call helpers and each other; only the ``__main__`` block and
+    bare test calls are dropped. Each top-level ``test_*`` function gets a
+    snippet that just calls it. Returns an empty test list when the code does
+    not parse, a test cannot be called without arguments, or the ``__main__``
+    block does anything besides calling tests, since splitting would skip it.
+    """
+    code = _strip_code_fences(code)
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code, []
+    
+    lines = code.splitlines()
+    excluded = set()
+    tests = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test_"):
+            args = node.args
+            if node.decorator_list or args.args or args.posonlyargs or args.kwonlyargs or args.vararg or args.kwarg:
+                return code, []
+            if isinstance(node, ast.AsyncFunctionDef):
+                tests.append((node.name, f"import asyncio\nasyncio.run({node.name}())\n"))
+            else:
+                tests.append((node.name, f"{node.name}()\n"))
+        elif _is_main_guard(node):
+            if node.orelse or not all(_is_test_call(stmt) for stmt in node.body):
+                return code, []
+            excluded.update(range(node.lineno, node.end_lineno + 1))
+        elif _is_test_call(node):
+            excluded.update(range(node.lineno, node.end_lineno + 1))
+    
+    prelude = "\n".join(line for i, line in enumerate(lines, 1) if i not in excluded)
+    return prelude, tests
+
+
+# slots=True drops the per-instance __dict__. Keep any subclass a slotted
+# dataclass as well, otherwise it brings the __dict__ back.
+@dataclass(slots=True)
 class WorkflowState:
     user_message: str = ""
-    messages: List[Any] = field(default_factory=list)
+    messages: Deque[Tuple[str, str]] = field(default_factory=lambda: deque(maxlen=MAX_MESSAGES))
     current_state: str = "code"
     data: Dict[str, Any] = field(default_factory=dict)
     retry_count: int = 1
@@ -38,21 +375,16 @@ class BaseAgent(ABC):
         pass
     
     def add_message(self, state: WorkflowState, msg: str):
-        msg = f"{self.name}: {msg}"
         if state.messages is None:
-            state.messages = []
-        state.messages.append(msg)
+            state.messages = deque(maxlen=MAX_MESSAGES)
+        state.messages.append((self.name, msg))
 
 
 class CodingAgent(BaseAgent):
     def __init__(self, name="CodingAgent"):
         super().__init__(name)
-        self.role = "CodingAgent"  
-    async def process(self, state: WorkflowState) -> WorkflowState:
-        error_context = ""
-        if state.retry_count > 1:
-            error_msg = state.data.get('error_message', 'Unknown error')
-            error_context = f"\n\nPREVIOUS ERROR TO FIX:\n{error_msg}\n\nPlease fix the above error in your code."
+        self.role = "CodingAgent"
+        self._prompt_cache = LRUCache(PROMPT_CACHE_SIZE)
         
         prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a code generator. Generate ONLY executable code.
@@ -63,19 +395,74 @@ class CodingAgent(BaseAgent):
             - Add error handling and test cases
             - Code must be self-contained and executable
             - Do not include explanations outside the code
-            OUTPUT ONLY the code, nothing else."""),
+            OUTPUT ONLY the code in a single fenced block tagged with its language
+            (```python, ```java, ```javascript or ```cpp), nothing else."""),
             ("human", """{query}{error_context}""")
         ])
-        try:
-            chain = prompt | self.llm
-            response = await chain.ainvoke({
+        self._generate_chain = prompt | self.llm
+        
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are fixing code that failed to run correctly.
+            You are given the original task, the current code and the error it produced.
+            STRICT REQUIREMENTS:
+            - Respond ONLY with a unified diff against the current code
+            - Start every hunk with a @@ -start,count +start,count @@ header
+            - Keep a few unchanged lines of context around every change
+            - Change only what is needed to fix the error
+            - Do not include explanations outside the diff"""),
+            ("human", """TASK:\n{query}\n\nCURRENT CODE:\n{code}\n\nERROR:\n{error}""")
+        ])
+        self._patch_chain = prompt | self.llm
+    
+    async def _generate(self, state: WorkflowState) -> str:
+        # Any attempt after a failure carries the error, so a retry never
+        # shares a cache entry (and the same output) with the first attempt
+        error_context = ""
+        error_msg = state.data.get('error_message')
+        if state.retry_count > 0 and error_msg:
+            error_context = f"\n\nPREVIOUS ERROR TO FIX:\n{error_msg}\n\nPlease fix the above error in your code."
+        
+        key = _cache_key(q=state.user_message, e=_normalize_error(error_context))
+        content = self._prompt_cache.get(key)
+        if content is None:
+            response = await self._generate_chain.ainvoke({
                 "query": state.user_message,
                 "error_context": error_context
             })
-            
             content = response.content.strip()
+            self._prompt_cache.put(key, content)
+        return content
+    
+    async def _generate_patch(self, state: WorkflowState, previous_code: str) -> Optional[str]:
+        error_msg = state.data.get('error_message', 'Unknown error')
+        key = _cache_key(q=state.user_message, e=_normalize_error(error_msg), c=previous_code)
+        content = self._prompt_cache.get(key)
+        if content is None:
+            response = await self._patch_chain.ainvoke({
+                "query": state.user_message,
+                "code": previous_code,
+                "error": error_msg
+            })
+            content = _apply_unified_diff(previous_code, response.content)
+            if content is None:
+                return None
+            self._prompt_cache.put(key, content)
+        return content
+    
+    async def process(self, state: WorkflowState) -> WorkflowState:
+        try:
+            content = None
+            previous_code = state.data.get('code')
+            if state.retry_count > 0 and previous_code and state.data.get('error_message'):
+                content = await self._generate_patch(state, previous_code)
+                if content is None:
+                    self.add_message(state, "Patch did not apply, regenerating the full code")
+            if content is None:
+                content = await self._generate(state)
+                # A patch keeps the language of the code it was applied to
+                state.data['language'] = _detect_language(content)
             
-            state.data['code'] = content
+            state.data['code'] = _strip_code_fences(content)
             self.add_message(state, f"Code generated (attempt {state.retry_count}):\n{state.data['code']}\n\n")
             
             state.current_state = "execute" 
@@ -85,9 +472,9 @@ class CodingAgent(BaseAgent):
             state.data['error_message'] = f"Code generation error: {str(e)}"
             state.current_state = "test"
         
-        print(f"\n=== ATTEMPT {state.retry_count} - GENERATED CODE ===")
-        print(state.data.get('code', 'No code generated'))
-        print("=" * 50)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n=== ATTEMPT %d - GENERATED CODE ===\n%s\n%s",
+                         state.retry_count, state.data.get('code', 'No code generated'), "=" * 50)
         return state
 
 
@@ -96,51 +483,26 @@ class CodeExecutorAgent(BaseAgent):
         super().__init__(name)
         self.role = "ExecutionAgent"
         self._tools_cache = None
+        self._tools_task: Optional[asyncio.Task] = None
+        self._exec_cache = LRUCache(EXECUTION_CACHE_SIZE)
+        self._react_agent = None
+        self._execute_tool = None
+        self._agent_tools = None
+        self._session: Optional[ClientSession] = None
+        self._session_task: Optional[asyncio.Task] = None
+        self._session_ready: Optional[asyncio.Event] = None
+        self._session_closing: Optional[asyncio.Event] = None
         self._connection_attempts = 0
         self._max_connection_attempts = 3
     
     def analyze_execution_result(self, response_content: str) -> tuple[bool, str]:
-        content = response_content.lower()
-        definite_errors = [
-            'traceback (most recent call last)',
-            'syntaxerror:',
-            'nameerror:',
-            'indentationerror:',
-            'typeerror:',
-            'valueerror:',
-            'attributeerror:',
-            'importerror:',
-            'modulenotfounderror:',
-            'keyerror:',
-            'indexerror:',
-            'zerodivisionerror:',
-            'execution failed',
-            'error occurred',
-            'failed to execute',
-            'unable to execute',
-            'internal error'
-            'fail',
-            'error',
-            'exception'
-            
-        ]
-        
-        success_indicators = [
-            'success',
-            'passed',
-            'executed successfully',
-            'completed successfully',
-            'execution completed',
-            'ran successfully',
-        ]
-        
-        if any(error in content for error in definite_errors):
+        if _ERROR_RE.search(response_content):
             return False, response_content
             
-        if any(success in content for success in success_indicators):
+        if _SUCCESS_RE.search(response_content):
             return True, response_content
             
-        if 'sorry' in content or 'unable' in content or 'cannot' in content:
+        if _REFUSAL_RE.search(response_content):
             return False, response_content
             
         return True, response_content
@@ -149,32 +511,210 @@ class CodeExecutorAgent(BaseAgent):
         if self._tools_cache is not None:
             return self._tools_cache
         
-        self._connection_attempts += 1
-        if self._connection_attempts > self._max_connection_attempts:
-            print(f"Max connection attempts ({self._max_connection_attempts}) reached")
-            return []
+        connecting = self._session_task is not None and not self._session_task.done()
+        if not connecting:
+            self._connection_attempts += 1
+            if self._connection_attempts > self._max_connection_attempts:
+                logger.warning("Max connection attempts (%d) reached", self._max_connection_attempts)
+                return []
             
         try:
-            SERVER_URL = "http://127.0.0.1:8000/mcp"
-            print(f"Attempting to connect to MCP server (attempt {self._connection_attempts})...")
-            
-            async with streamablehttp_client(SERVER_URL) as (read, write, _):
-                async with ClientSession(read, write) as session:
-                    await asyncio.wait_for(session.initialize(), timeout=10)
-                    tools = await asyncio.wait_for(load_mcp_tools(session), timeout=10)
-                    self._tools_cache = tools
-                    print(f"Successfully connected to MCP server with {len(tools)} tools")
-                    return tools
+            if not connecting:
+                logger.info("Attempting to connect to MCP server (attempt %d)...", self._connection_attempts)
+            await self.start()
+            tools = self._tools_cache
+            logger.info("Successfully connected to MCP server with %d tools", len(tools))
+            return tools
         except asyncio.TimeoutError:
-            print(f"Connection timeout on attempt {self._connection_attempts}")
+            logger.warning("Connection timeout on attempt %d", self._connection_attempts)
             return []
         except Exception as e:
-            print(f"Connection failed on attempt {self._connection_attempts}: {e}")
+            logger.warning("Connection failed on attempt %d: %s", self._connection_attempts, e)
             return []
     
+    async def _hold_session(self):
+        try:
+            async with streamablehttp_client(
+                MCP_SERVER_URL, httpx_client_factory=_mcp_http_client_factory
+            ) as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await asyncio.wait_for(session.initialize(), timeout=10)
+                    self._tools_cache = await asyncio.wait_for(load_mcp_tools(session), timeout=10)
+                    self._session = session
+                    self._session_ready.set()
+                    await self._session_closing.wait()
+        finally:
+            self._session = None
+            self._tools_cache = None
+            self._session_ready.set()
+    
+    async def start(self):
+        """Open a long-lived MCP session and load its tools.
+
+        The transport and session are entered and exited inside a single
+        background task, so the loaded tools stay bound to a live session
+        across retries until aclose() is called.
+        """
+        if self._session is not None:
+            return
+        if self._session_task is None or self._session_task.done():
+            self._session_ready = asyncio.Event()
+            self._session_closing = asyncio.Event()
+            self._session_task = asyncio.create_task(self._hold_session())
+        await self._session_ready.wait()
+        if self._session is None:
+            session_task, self._session_task = self._session_task, None
+            await session_task
+            raise ConnectionError("MCP session closed before it was ready")
+    
+    async def aclose(self):
+        """Close the session opened by start() and reset the connection budget."""
+        self._connection_attempts = 0
+        tools_task, self._tools_task = self._tools_task, None
+        if tools_task is not None and not tools_task.done():
+            tools_task.cancel()
+        session_task, self._session_task = self._session_task, None
+        if session_task is None:
+            return
+        if self._session_ready.is_set():
+            self._session_closing.set()
+        else:
+            session_task.cancel()
+        try:
+            await session_task
+        except (asyncio.CancelledError, Exception) as e:
+            logger.warning("MCP session closed with error: %r", e)
+    
+    def prefetch_tools(self):
+        """Start connecting to the MCP server in the background so the handshake
+        overlaps with code generation. The first process() call awaits it."""
+        if self._tools_cache is None and self._tools_task is None:
+            self._tools_task = asyncio.create_task(self.get_interpreter_tools())
+    
+    def _bind_tools(self, tools: List[Any]):
+        if tools is self._agent_tools:
+            return
+        self._agent_tools = tools
+        self._execute_tool = next((t for t in tools if t.name == EXECUTE_TOOL_NAME), None)
+        self._react_agent = None
+        if self._execute_tool is None:
+            logger.info("No '%s' tool found, falling back to a ReAct agent", EXECUTE_TOOL_NAME)
+    
+    def _parse_tool_result(self, raw: Any) -> tuple[bool, str]:
+        if isinstance(raw, list):
+            raw = "\n".join(item.get("text", "") if isinstance(item, dict) else str(item) for item in raw)
+        text = str(raw)
+        try:
+            result = _loads(text)
+        except ValueError:
+            return self.analyze_execution_result(text)
+        if not isinstance(result, dict) or 'success' not in result:
+            return self.analyze_execution_result(text)
+        return bool(result['success']), _format_report(result.get('output', ''), result.get('error', ''))
+    
+    async def _run_one(self, code: str, language: Optional[str]) -> tuple[bool, str]:
+        # The tool needs a language; code whose language is unknown goes to the
+        # ReAct agent, which works it out from the code itself.
+        if self._execute_tool is not None and language is not None:
+            raw = await asyncio.wait_for(
+                self._execute_tool.ainvoke({"code": code, "language": language}),
+                timeout=EXECUTION_TIMEOUT
+            )
+            is_successful, response_content = self._parse_tool_result(raw)
+            logger.info("Execution response: %.300s...", response_content)
+            return is_successful, response_content
+        
+        if self._react_agent is None:
+            self._react_agent = create_react_agent(model=self.llm, tools=self._agent_tools)
+        subject = f"this {language} code" if language else "this code"
+        execution_message = f"""Execute {subject} and report the result as JSON:
+              {code}"""
+        
+        result = await asyncio.wait_for(
+            self._react_agent.ainvoke({
+                "messages": [
+                    EXECUTOR_SYSTEM_MESSAGE,
+                    {"role": "user", "content": execution_message}
+                ]
+            }),
+            timeout=EXECUTION_TIMEOUT
+        )
+        
+        response_content = result["messages"][-1].content
+        logger.info("Execution response: %.300s...", response_content)
+        try:
+            exec_result = ExecResult.model_validate_json(_strip_code_fences(response_content.strip()))
+        except ValidationError:
+            return self.analyze_execution_result(response_content)
+        return exec_result.status == "success", _format_report(exec_result.stdout, exec_result.error)
+    
+    async def _run_tests(self, prelude: str, tests: List[tuple[str, str]], language: str) -> tuple[bool, str]:
+        semaphore = asyncio.Semaphore(TEST_CONCURRENCY)
+        
+        async def run(snippet: str) -> tuple[bool, str]:
+            async with semaphore:
+                return await self._run_one(f"{prelude}\n\n{snippet}", language)
+        
+        results = await asyncio.gather(*(run(snippet) for _, snippet in tests), return_exceptions=True)
+        
+        reports = []
+        failures = []
+        for (name, _), result in zip(tests, results):
+            if isinstance(result, asyncio.TimeoutError):
+                failures.append(f"{name}: timed out after {EXECUTION_TIMEOUT} seconds")
+            elif isinstance(result, Exception):
+                failures.append(f"{name}: execution error: {result}")
+            else:
+                passed, report = result
+                (reports if passed else failures).append(f"{name}: {report}")
+        if failures:
+            return False, "\n\n".join(failures)
+        return True, "\n\n".join(reports)
+    
+    def _record_result(self, state: WorkflowState, is_successful: bool, processed_response: str):
+        if is_successful:
+            state.data['execution_status'] = 'success'
+            state.data['result'] = processed_response
+            state.data.pop('error_message', None)
+            logger.info("Execution marked as SUCCESS")
+        else:
+            state.data['execution_status'] = 'failure'
+            state.data['error_message'] = processed_response
+            logger.info("Execution marked as FAILURE")
+        
+        self.add_message(state, f"Execution completed: {processed_response[:150]}...")
+    
     async def process(self, state: WorkflowState) -> WorkflowState:
+        code = state.data.get('code')
+        language = state.data.get('language')
+        if code is None:
+            static_error = "No code was generated"
+        elif language == "python":
+            static_error = _static_check(code)
+        else:
+            static_error = None
+        if static_error:
+            state.data['execution_status'] = 'failure'
+            state.data['error_message'] = static_error
+            self.add_message(state, f"Static check failed: {static_error}")
+            logger.info("Static check FAILED: %s", static_error)
+            state.current_state = "test"
+            return state
+        
+        cache_key = _cache_key(c=code, l=language)
+        cached = self._exec_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Reusing result of an identical earlier execution")
+            self._record_result(state, *cached)
+            state.current_state = "test"
+            return state
+        
         try:
-            tools = await self.get_interpreter_tools()
+            if self._tools_task is not None:
+                tools_task, self._tools_task = self._tools_task, None
+                tools = await tools_task
+            else:
+                tools = await self.get_interpreter_tools()
             if not tools:
                 state.data['execution_status'] = 'failure'
                 state.data['error_message'] = 'Could not connect to code execution server after multiple attempts'
@@ -182,55 +722,31 @@ class CodeExecutorAgent(BaseAgent):
                 state.current_state = "test"
                 return state
             
-            agent = create_react_agent(model=self.llm, tools=tools)
-            
-            execution_message = f"""Execute this code and show me the output:
-              {state.data['code']}
-              Run the code and tell me:
-              1. What output it produces
-              2. If there are any errors with details(failure or error or exception)
-              3. Whether it executed successfully(success or passed)"""
+            self._bind_tools(tools)
             
             try:
-                print("Executing code...")
-                result = await asyncio.wait_for(
-                    agent.ainvoke({
-                        "messages": [
-                            {"role": "system", "content": "Execute the code provided by the user using given tools and report detailed results."},
-                            {"role": "user", "content": execution_message}
-                        ]
-                    }),
-                    timeout=45
-                )
-                
-                response_content = result["messages"][-1].content
-                print(f"\nExecution response: {response_content[:300]}...")
-                
-                is_successful, processed_response = self.analyze_execution_result(response_content)
-                
-                if is_successful:
-                    state.data['execution_status'] = 'success'
-                    state.data['result'] = processed_response
-                    state.data.pop('error_message', None)
-                    print("Execution marked as SUCCESS")
+                logger.info("Executing code...")
+                prelude, tests = _split_tests(code) if language == "python" else ("", [])
+                if len(tests) > 1:
+                    logger.info("Running %d independent tests concurrently", len(tests))
+                    is_successful, processed_response = await self._run_tests(prelude, tests, language)
                 else:
-                    state.data['execution_status'] = 'failure'
-                    state.data['error_message'] = processed_response
-                    print("Execution marked as FAILURE")
+                    is_successful, processed_response = await self._run_one(code, language)
                 
-                self.add_message(state, f"Execution completed: {processed_response[:150]}...")
+                self._exec_cache.put(cache_key, (is_successful, processed_response))
+                self._record_result(state, is_successful, processed_response)
                 
             except asyncio.TimeoutError:
                 state.data['execution_status'] = 'failure'
-                state.data['error_message'] = "Code execution timed out after 45 seconds"
+                state.data['error_message'] = f"Code execution timed out after {EXECUTION_TIMEOUT} seconds"
                 self.add_message(state, "Execution failed: Timeout")
-                print("Execution TIMEOUT")
+                logger.warning("Execution TIMEOUT")
                 
         except Exception as e:
             state.data['execution_status'] = 'failure'
             state.data['error_message'] = f"Execution system error: {str(e)}"
             self.add_message(state, f"Execution system error: {str(e)}")
-            print(f"Execution SYSTEM ERROR: {e}")
+            logger.error("Execution SYSTEM ERROR: %s", e)
         
         state.current_state = "test"
         return state
@@ -244,36 +760,35 @@ class TestingAgent(BaseAgent):
     async def process(self, state: WorkflowState) -> WorkflowState:
         execution_status = state.data.get("execution_status", "failure")
         
-        print(f"\n=== TEST RESULTS ===")
-        print(f"Status: {execution_status}")
-        print(f"Attempt: {state.retry_count}")
+        logger.info("=== TEST RESULTS === status: %s, attempt: %d", execution_status, state.retry_count)
         
         if execution_status == 'failure':
             state.retry_count += 1
             
             if state.retry_count > state.max_retries:
-                print(f"Maximum retries ({state.max_retries}) exceeded")
+                logger.info("Maximum retries (%d) exceeded", state.max_retries)
                 self.add_message(state, f"Workflow failed after {state.max_retries} attempts")
                 state.current_state = "end"
             else:
                 error_msg = state.data.get('error_message', 'Unknown error')
-                print(f"Retrying due to: {error_msg[:100]}...")
+                logger.info("Retrying due to: %.100s...", error_msg)
                 self.add_message(state, f"Retry {state.retry_count}: {error_msg[:100]}...")
                 state.current_state = "code"
         else:
-            print(f"Success on attempt {state.retry_count}")
+            logger.info("Success on attempt %d", state.retry_count)
             self.add_message(state, f"Workflow completed successfully on attempt {state.retry_count}")
             state.current_state = "end"
-        
-        print("=" * 20)
         return state
 
 
 class WorkflowManager:
-    def __init__(self):
+    def __init__(self, speculative_retries: bool = True):
+        self.speculative_retries = speculative_retries
         self.coding_agent = CodingAgent()
         self.executor_agent = CodeExecutorAgent()
         self.testing_agent = TestingAgent()
+        self._workflow = self._build_workflow()
+        self._active_runs = 0
     
     def _build_workflow(self):
         workflow = StateGraph(WorkflowState)
@@ -301,37 +816,89 @@ class WorkflowManager:
         return workflow.compile()
     
     async def _code_node(self, state: WorkflowState) -> WorkflowState:
+        speculative_code = state.data.pop('speculative_code', None)
+        if speculative_code is not None:
+            state.data['code'] = speculative_code
+            self.coding_agent.add_message(state, f"Using speculative code (attempt {state.retry_count}):\n{speculative_code}\n\n")
+            state.current_state = "execute"
+            return state
         return await self.coding_agent.process(state)
     
     async def _execute_node(self, state: WorkflowState) -> WorkflowState:
-        return await self.executor_agent.process(state)
+        # After a first failure, draft the next attempt while this one runs.
+        # The draft fixes the error that is known now, so it is only used if
+        # this run fails with that same error; it is dropped on success or on
+        # a different error. The last attempt never speculates.
+        if not (self.speculative_retries and 1 <= state.retry_count < state.max_retries):
+            return await self.executor_agent.process(state)
+        
+        draft_error = _normalize_error(state.data.get('error_message'))
+        speculative_state = WorkflowState(
+            user_message=state.user_message,
+            data=dict(state.data),
+            retry_count=state.retry_count + 1,
+            max_retries=state.max_retries,
+        )
+        speculative_task = asyncio.create_task(self.coding_agent.process(speculative_state))
+        try:
+            state = await self.executor_agent.process(state)
+        except BaseException:
+            speculative_task.cancel()
+            raise
+        
+        if state.data.get('execution_status') == 'success' or _normalize_error(state.data.get('error_message')) != draft_error:
+            speculative_task.cancel()
+            return state
+        
+        speculative_state = await speculative_task
+        if speculative_state.current_state == "execute":
+            state.data['speculative_code'] = speculative_state.data['code']
+        return state
     
     async def _test_node(self, state: WorkflowState) -> WorkflowState:
         return await self.testing_agent.process(state)
     
     async def run_workflow(self, user_message: str) -> WorkflowState:
-        workflow = self._build_workflow()
+        workflow = self._workflow
         
         initial_state = WorkflowState(
             user_message=user_message,
-            messages=[],
+            messages=deque(maxlen=MAX_MESSAGES),
             current_state="code",
             data={},
             retry_count=0
         )
+        self._active_runs += 1
+        self.executor_agent.prefetch_tools()
         
         try:
             final_state = await workflow.ainvoke(initial_state)
             return final_state
         except Exception as e:
-            print(f"Workflow execution error: {e}")
+            logger.error("Workflow execution error: %s", e)
             initial_state.data['error'] = str(e)
             return initial_state
+        finally:
+            self._active_runs -= 1
+            if self._active_runs == 0:
+                await self.executor_agent.aclose()
+
+
+_manager: Optional[WorkflowManager] = None
+
+
+def get_manager() -> WorkflowManager:
+    """Return the process-wide WorkflowManager, creating it on first use."""
+    global _manager
+    if _manager is None:
+        _manager = WorkflowManager()
+    return _manager
 
 
 async def main():
+    listener = configure_logging()
     try:
-        manager = WorkflowManager()
+        manager = get_manager()
         
         user_query = "Create a Python program that calculates the factorial of a number and test it with several test cases including edge cases."
         
@@ -363,6 +930,8 @@ async def main():
         print(f"Main execution error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
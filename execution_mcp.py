@@ -5,16 +5,37 @@ Supports Python, Java, JavaScript (Node.js), and C++.
 Run with:
     python code_executor_server.py
 """
+import asyncio
+import atexit
+import builtins
+import contextlib
+import hashlib
+import io
+import re
+import selectors
+import shutil
+import stat
 import subprocess
+import sys
 import tempfile
+import threading
+import traceback
+import uuid
 import os
 import time
 import logging
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel
 
+try:
+    import resource
+except ImportError:
+    resource = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,21 +48,609 @@ class CodeSnippet(BaseModel):
 
 mcp = FastMCP("CodeExecutorServer")
 
+# Program run by warm Python workers. The first line on stdin is the path of
+# the script to run; everything after it is left for the script's own input.
+# The path is read from fd 0 one byte at a time so sys.stdin buffers none of
+# that input. runpy makes the script the real __main__ module, and the
+# bootstrap and runpy frames are dropped from tracebacks so they match
+# `python file`.
+PYTHON_BOOTSTRAP = """\
+import os, runpy, sys
+path = bytearray()
+while (byte := os.read(0, 1)) not in (b'', b'\\n'):
+    path += byte
+path = os.fsdecode(bytes(path))
+sys.argv = [path]
+sys.path[0] = os.path.dirname(path)
+try:
+    runpy.run_path(path, run_name='__main__')
+except (SystemExit, KeyboardInterrupt):
+    raise
+except BaseException as e:
+    import traceback
+    tb = e.__traceback__
+    internal = {'<string>', '<frozen runpy>', runpy.__file__}
+    while tb is not None and tb.tb_frame.f_code.co_filename in internal:
+        tb = tb.tb_next
+    traceback.print_exception(type(e), e, tb)
+    sys.exit(1)
+"""
+
+# Child processes are started with an absolute executable path and
+# close_fds=False so CPython can use posix_spawn() instead of fork()+exec(),
+# which avoids copying the server's page tables on every run. Descriptors the
+# server opens are non-inheritable by default (PEP 446), so children still
+# only receive their own stdio pipes.
+@lru_cache(maxsize=None)
+def resolve_command(name: str) -> str:
+    """Return the absolute path of an executable, or the name if it is not on PATH"""
+    return shutil.which(name) or name
+
+def write_source(path: str, code: str):
+    """Write source code to path with raw os.write calls, readable only by the owner"""
+    data = memoryview(code.encode())
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+@lru_cache(maxsize=None)
+def toolchain_version(name: str) -> str:
+    """Return the first line of a toolchain's version banner, or '' if it cannot run"""
+    try:
+        result = subprocess.run(
+            [resolve_command(name), '-version' if name in ('java', 'javac') else '--version'],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            close_fds=False
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ''
+    banner = (result.stdout or result.stderr).strip()
+    return banner.splitlines()[0] if banner else ''
+
+def _memory_backed_tmpdir() -> Optional[str]:
+    """Return /dev/shm if it is a usable, executable tmpfs mount, else None"""
+    shm = '/dev/shm'
+    if not os.path.isdir(shm) or not os.access(shm, os.W_OK | os.X_OK):
+        return None
+    try:
+        if os.statvfs(shm).f_flag & os.ST_NOEXEC:
+            return None  # compiled programs could not be run from here
+    except OSError:
+        return None
+    return shm
+
+# Source files, compiler intermediates and binaries go to memory when possible;
+# None lets tempfile fall back to the default temporary directory.
+SCRATCH_DIR = _memory_backed_tmpdir()
+
+def private_dir(name: str) -> str:
+    """
+    Return a per-user directory under the scratch root that only this user can use
+    
+    Cache directories hold programs the server executes, so one that another
+    user created or can write to is never trusted; a fresh private directory
+    is used instead.
+    
+    Args:
+        name (str): Base name of the directory
+        
+    Returns:
+        Path of a directory owned by the current user with mode 0o700
+    """
+    base = SCRATCH_DIR or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, 'getuid') else None
+    path = os.path.join(base, name if uid is None else f'{name}-{uid}')
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    try:
+        st = os.lstat(path)
+        if stat.S_ISDIR(st.st_mode) and (uid is None or st.st_uid == uid) and not st.st_mode & 0o077:
+            return path
+    except OSError:
+        pass
+    logger.warning(f"{path} is not a private directory; using a fresh one instead")
+    return tempfile.mkdtemp(prefix=f'{name}-', dir=base)
+
+# Snippets are short, so skip optimization; -pipe keeps compiler stages off disk.
+# -fno-exceptions/-fno-rtti are left out because they reject valid programs.
+CPP_COMPILE_FLAGS = ['-O0', '-pipe']
+
+def _cpp_compiler() -> List[str]:
+    """Return the g++ command, wrapped in ccache when it is installed"""
+    if shutil.which('ccache'):
+        if 'CCACHE_DIR' not in os.environ:
+            os.environ['CCACHE_DIR'] = private_dir('mcp_ccache')
+        # ccache defaults to 5 GB, far more than a tmpfs like Docker's 64 MB /dev/shm
+        os.environ.setdefault('CCACHE_MAXSIZE', '256M')
+        return [resolve_command('ccache'), resolve_command('g++')]
+    return [resolve_command('g++')]
+
+# Resolved once at import, before any worker thread touches os.environ
+CPP_COMPILER = _cpp_compiler()
+
+# Snippets mentioning any of these are never run inside the server process,
+# since they can touch the process, the file system or the interpreter state.
+# This only keeps honest code from disturbing the server; it is a text match,
+# not a sandbox, and code built to get around it will.
+INPROCESS_DENYLIST = re.compile(
+    r'\b(?:os|sys|subprocess|shutil|socket|signal|ctypes|threading|multiprocessing|'
+    r'asyncio|importlib|builtins|gc|resource|pathlib|tempfile|io)\b'
+    r'|__\w+__|\b(?:open|exec|eval|compile|exit|quit|globals|breakpoint|input)\s*\('
+)
+
+@lru_cache(maxsize=256)
+def compile_snippet(code: str):
+    """Compile a Python snippet once; retries of the same code reuse the code object"""
+    return compile(code, '<snippet>', 'exec')
+
+_JAVA_CLASS_RE = re.compile(r'public\s+class\s+(\w+)')
+_HAS_PUBLIC_CLASS = re.compile(r'\bpublic\s+class\b').search
+
+# Statement-level Java snippets are wrapped as-is; Java ignores indentation, and
+# "throws Exception" lets snippets call methods with checked exceptions.
+JAVA_MAIN_TEMPLATE = (
+    'public class {class_name} {{\n'
+    '  public static void main(String[] args) throws Exception {{\n'
+    '{code}\n'
+    '  }}\n'
+    '}}'
+)
+
+# Resource limits for user programs. A preexec_fn would disable the
+# posix_spawn fast path, so one-shot programs are started through util-linux
+# prlimit(1), which sets the limits and then execs the program. Without it,
+# and for warm workers that wait for a script, the limits are applied to the
+# running child with prlimit(2). Compilers run without limits.
+MAX_MEMORY_BYTES = 512 << 20
+MAX_FILE_BYTES = 16 << 20
+
+def program_limits(timeout: float, limit_memory: bool = True) -> List[Tuple[int, Tuple[int, int]]]:
+    """
+    Build the rlimits for a user program
+    
+    Args:
+        timeout (float): Wall-clock timeout; CPU time is capped to match it
+        limit_memory (bool): Cap the address space. Runtimes that reserve large
+            virtual ranges up front (the JVM, V8) fail to start under the cap.
+        
+    Returns:
+        List of (resource, (soft, hard)) pairs, empty where rlimits are unsupported
+    """
+    if resource is None or not hasattr(resource, 'prlimit'):
+        return []
+    cpu_seconds = max(int(timeout), 1)
+    limits = [
+        (resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1)),
+        (resource.RLIMIT_FSIZE, (MAX_FILE_BYTES, MAX_FILE_BYTES)),
+    ]
+    if limit_memory:
+        limits.append((resource.RLIMIT_AS, (MAX_MEMORY_BYTES, MAX_MEMORY_BYTES)))
+    return limits
+
+def _prlimit_command() -> Optional[str]:
+    """Return the util-linux prlimit executable, or None if it is not installed"""
+    path = shutil.which('prlimit')
+    if path and 'util-linux' in toolchain_version('prlimit'):
+        return path
+    return None
+
+PRLIMIT_COMMAND = _prlimit_command()
+
+def limited_command(cmd: List[str], limits: List[Tuple[int, Tuple[int, int]]]) -> List[str]:
+    """Prefix cmd with prlimit(1) so the limits hold from the program's exec"""
+    options = {
+        resource.RLIMIT_CPU: '--cpu',
+        resource.RLIMIT_AS: '--as',
+        resource.RLIMIT_FSIZE: '--fsize',
+    }
+    return [
+        PRLIMIT_COMMAND,
+        *(f'{options[limit]}={soft}:{hard}' for limit, (soft, hard) in limits),
+        '--',
+        *cmd
+    ]
+
+def apply_limits(proc: subprocess.Popen, limits: List[Tuple[int, Tuple[int, int]]]):
+    """Apply rlimits to a running child process"""
+    for limit, value in limits:
+        try:
+            resource.prlimit(proc.pid, limit, value)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not apply resource limit {limit} to pid {proc.pid}: {e}")
+
+# Snippets are small and short-lived: a serial GC, C1-only JIT and a small
+# initial heap start the JVM noticeably faster than the server defaults.
+JAVA_RUN_FLAGS = ['-XX:+UseSerialGC', '-XX:TieredStopAtLevel=1', '-Xms16m']
+
+# Exercises the JDK classes typical snippets load, so they land in the CDS archive
+JAVA_CDS_PROBE = """\
+import java.util.*;
+
+public class CdsProbe {
+  public static void main(String[] args) throws Exception {
+    Scanner scanner = new Scanner(System.in);
+    List<Integer> numbers = new ArrayList<>();
+    while (scanner.hasNextInt()) {
+      numbers.add(scanner.nextInt());
+    }
+    Map<String, Integer> counts = new HashMap<>();
+    counts.put("total", numbers.stream().mapToInt(Integer::intValue).sum());
+    StringBuilder out = new StringBuilder(String.format("%d %s", numbers.size(), counts));
+    System.out.println(out);
+  }
+}
+"""
+
+def build_java_cds_archive(root: str, timeout: float) -> Optional[str]:
+    """
+    Create a class data sharing (CDS) archive of the JDK classes snippets use
+    
+    The archive is named after the java version, so it is reused across server
+    restarts and rebuilt after a JDK upgrade.
+    
+    Args:
+        root (str): Directory that holds the archive
+        timeout (float): Time limit for each java/javac invocation
+        
+    Returns:
+        Path of the archive, or None if java is missing or the JVM cannot dump one
+    """
+    if not shutil.which('java') or not shutil.which('javac'):
+        return None
+    
+    version = hashlib.blake2b(toolchain_version('java').encode(), digest_size=8).hexdigest()
+    archive = os.path.join(root, f'classes-{version}.jsa')
+    if os.path.exists(archive):
+        return archive
+    
+    os.makedirs(root, mode=0o700, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=root) as work:
+        class_list = os.path.join(work, 'classes.lst')
+        jdk_list = os.path.join(work, 'jdk-classes.lst')
+        staged_archive = os.path.join(work, 'classes.jsa')
+        write_source(os.path.join(work, 'CdsProbe.java'), JAVA_CDS_PROBE)
+        
+        def run(cmd: List[str]) -> bool:
+            try:
+                result = subprocess.run(
+                    cmd,
+                    input='1 2 3\n',
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout,
+                    close_fds=False
+                )
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.warning(f"Java CDS archive not created: {e}")
+                return False
+            if result.returncode != 0:
+                logger.warning(f"Java CDS archive not created: {result.stderr.strip()[:200]}")
+                return False
+            return True
+        
+        if not (run([resolve_command('javac'), '-d', work, os.path.join(work, 'CdsProbe.java')])
+                and run([resolve_command('java'), '-Xshare:off', f'-XX:DumpLoadedClassList={class_list}',
+                         '-cp', work, 'CdsProbe'])):
+            return None
+        
+        # Keep JDK classes only, so the archive does not pin a class path
+        with open(class_list) as src, open(jdk_list, 'w') as dst:
+            dst.writelines(line for line in src if not line.startswith('CdsProbe'))
+        
+        if not run([resolve_command('java'), '-Xshare:dump', f'-XX:SharedClassListFile={jdk_list}',
+                    f'-XX:SharedArchiveFile={staged_archive}']):
+            return None
+        
+        os.replace(staged_archive, archive)
+    
+    logger.info(f"Java CDS archive ready at {archive}")
+    return archive
+
+# Programs are killed once stdout and stderr together exceed this many bytes
+MAX_OUTPUT_BYTES = 1 << 20
+
+def communicate_bounded(proc: subprocess.Popen, input_bytes: bytes, timeout: float,
+                        max_bytes: int = MAX_OUTPUT_BYTES) -> Tuple[str, str]:
+    """
+    Feed input to a child process and collect its output without unbounded buffering
+    
+    Args:
+        proc (subprocess.Popen): Child started with stdin, stdout and stderr pipes
+        input_bytes (bytes): Data written to the child's stdin
+        timeout (float): Seconds to wait before the child is killed
+        max_bytes (int): Output limit; the child is killed when it is exceeded
+        
+    Returns:
+        Tuple of decoded stdout and stderr. A note is appended to stderr when
+        the output was truncated.
+        
+    Raises:
+        subprocess.TimeoutExpired: If the child did not finish in time
+    """
+    deadline = time.monotonic() + timeout
+    pending = memoryview(input_bytes)
+    stdin_fd = proc.stdin.fileno()
+    buffers = {proc.stdout.fileno(): bytearray(), proc.stderr.fileno(): bytearray()}
+    received = 0
+    truncated = False
+    
+    with selectors.DefaultSelector() as selector:
+        for fd in buffers:
+            os.set_blocking(fd, False)
+            selector.register(fd, selectors.EVENT_READ)
+        if pending:
+            os.set_blocking(stdin_fd, False)
+            selector.register(stdin_fd, selectors.EVENT_WRITE)
+        else:
+            proc.stdin.close()
+        
+        while selector.get_map() and not truncated:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                proc.kill()
+                proc.wait()
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            
+            for key, _ in selector.select(remaining):
+                if key.fd == stdin_fd:
+                    try:
+                        pending = pending[os.write(stdin_fd, pending):]
+                    except BrokenPipeError:
+                        pending = pending[:0]  # the child stopped reading
+                    if not pending:
+                        selector.unregister(stdin_fd)
+                        proc.stdin.close()
+                    continue
+                
+                chunk = os.read(key.fd, 65536)
+                if not chunk:
+                    selector.unregister(key.fd)
+                    continue
+                buffers[key.fd] += chunk
+                received += len(chunk)
+                if received > max_bytes:
+                    truncated = True
+                    proc.kill()
+                    break
+    
+    if not proc.stdin.closed:
+        proc.stdin.close()
+    proc.stdout.close()
+    proc.stderr.close()
+    try:
+        proc.wait(max(deadline - time.monotonic(), 0))
+    except subprocess.TimeoutExpired:
+        # The child closed its output pipes but kept running
+        proc.kill()
+        proc.wait()
+        raise
+    
+    out, err = buffers.values()
+    if truncated:
+        del out[max_bytes:]
+        del err[max(max_bytes - len(out), 0):]
+    stdout = out.decode(errors='replace')
+    stderr = err.decode(errors='replace')
+    if truncated:
+        stderr += f"\n[output exceeded {max_bytes} bytes; program was killed]"
+    return stdout, stderr
+
+def run_bounded(cmd: List[str], input_bytes: bytes, timeout: float,
+                limits: List[Tuple[int, Tuple[int, int]]] = ()) -> Dict[str, Any]:
+    """Run a program with bounded output capture and return the executor's result dict"""
+    if limits and PRLIMIT_COMMAND:
+        cmd, limits = limited_command(cmd, limits), ()
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        close_fds=False
+    )
+    apply_limits(proc, limits)
+    stdout, stderr = communicate_bounded(proc, input_bytes, timeout)
+    return {
+        'success': proc.returncode == 0,
+        'output': stdout,
+        'error': stderr
+    }
+
+class WarmProcessPool:
+    """
+    Pool of interpreter processes started ahead of time
+    
+    Every worker runs exactly one program and then exits, so programs stay
+    isolated from each other. The pool hides interpreter start-up latency by
+    starting the replacement worker while the current program runs.
+    """
+    
+    def __init__(self, argv: List[str], size: int = 2, limits: List[Tuple[int, Tuple[int, int]]] = ()):
+        """
+        Initialize the pool
+        
+        Args:
+            argv (List[str]): Command that starts an idle worker
+            size (int): Number of idle workers to keep ready (default: 2)
+            limits (List): rlimits applied to each worker before it gets a program
+        """
+        self.argv = argv
+        self.size = size
+        self.limits = limits
+        self._idle: List[subprocess.Popen] = []
+        self._lock = threading.Lock()
+    
+    def _spawn(self) -> subprocess.Popen:
+        proc = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            close_fds=False
+        )
+        apply_limits(proc, self.limits)
+        return proc
+    
+    def acquire(self) -> subprocess.Popen:
+        """Take a ready worker, or start one if none is idle, and refill the pool in the background"""
+        proc = None
+        with self._lock:
+            while self._idle and proc is None:
+                candidate = self._idle.pop()
+                if candidate.poll() is None:
+                    proc = candidate
+        
+        if proc is None:
+            proc = self._spawn()
+        threading.Thread(target=self._refill, daemon=True).start()
+        return proc
+    
+    def _refill(self):
+        with self._lock:
+            missing = self.size - len(self._idle)
+        spare = [self._spawn() for _ in range(missing)]
+        with self._lock:
+            self._idle.extend(spare)
+    
+    def close(self):
+        """Terminate all idle workers"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for proc in idle:
+            proc.kill()
+            proc.communicate()
+
+class CompileCache:
+    """
+    Directory of compiled programs keyed by source code and toolchain
+    
+    Each entry is a directory holding the build output for one source. Entries
+    are built in a staging directory and renamed into place, so concurrent
+    requests never see a half-written entry. The least recently used entries
+    are removed once the cache grows past max_entries.
+    """
+    
+    def __init__(self, root: str, max_entries: int = 256):
+        """
+        Initialize the cache
+        
+        Args:
+            root (str): Directory that holds the cache entries; see private_dir
+            max_entries (int): Maximum number of entries to keep (default: 256)
+        """
+        self.root = root
+        self.max_entries = max_entries
+        os.makedirs(root, mode=0o700, exist_ok=True)
+    
+    @staticmethod
+    def key(code: str, toolchain: str) -> str:
+        """Build the cache key for a source file and toolchain description"""
+        return hashlib.blake2b(f"{toolchain}\0{code}".encode(), digest_size=16).hexdigest()
+    
+    def get_or_build(self, key: str, build: Callable[[str], Optional[str]]) -> Tuple[str, Optional[str]]:
+        """
+        Return the entry directory for key, building it on a miss
+        
+        Args:
+            key (str): Cache key from CompileCache.key
+            build (Callable): Called with an empty directory to fill; returns an
+                error message if the build failed, None otherwise
+            
+        Returns:
+            Tuple of the entry directory and the build error, if any. Failed
+            builds are not cached.
+        """
+        entry = os.path.join(self.root, key)
+        if os.path.isdir(entry):
+            os.utime(entry)
+            return entry, None
+        
+        staging = tempfile.mkdtemp(prefix='.build-', dir=self.root)
+        try:
+            error = build(staging)
+            if error is not None:
+                return entry, error
+            try:
+                os.rename(staging, entry)
+                staging = None
+            except OSError:
+                pass  # another request built the same entry first
+        finally:
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+        
+        self._evict()
+        return entry, None
+    
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.root):
+            if name.startswith('.build-'):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            shutil.rmtree(path, ignore_errors=True)
+
 class MCPCodeExecutor:
     """
     Multi-language Code Processor and Executor
     Supports Python, Java, JavaScript (Node.js), and C++
     """
     
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, inprocess_python: bool = False):
         """
         Initialize the code executor
         
         Args:
             timeout (int): Maximum execution time in seconds (default: 10)
+            inprocess_python (bool): Run simple Python snippets inside the
+                server process instead of a subprocess. Trusted code only, this
+                is not a sandbox (default: False)
         """
         self.timeout = timeout
-        self.supported_languages = ['python', 'java', 'javascript', 'cpp', 'c++']
+        self.inprocess_python = inprocess_python
+        self._inprocess_lock = threading.Lock()
+        self._dispatch = {
+            'python': self._execute_python,
+            'java': self._execute_java,
+            'javascript': self._execute_javascript,
+            'cpp': self._execute_cpp,
+            'c++': self._execute_cpp
+        }
+        self.supported_languages = list(self._dispatch)
+        self.program_limits = program_limits(timeout)
+        self.runtime_limits = program_limits(timeout, limit_memory=False)
+        self.python_pool = WarmProcessPool(
+            [resolve_command('python'), '-c', PYTHON_BOOTSTRAP],
+            limits=self.program_limits
+        )
+        atexit.register(self.python_pool.close)
+        self.compile_cache = CompileCache(private_dir('mcp_compile_cache'))
+        
+        # One long-lived directory for interpreted sources; each run gets a
+        # unique file name in it, and a sweeper removes files left behind.
+        self.scratch_dir = tempfile.mkdtemp(prefix='mcp_exec_', dir=SCRATCH_DIR)
+        atexit.register(shutil.rmtree, self.scratch_dir, ignore_errors=True)
+        self._schedule_sweep()
+        
+        # Java runs with the start-up flags right away and switches to the CDS
+        # archive once it has been dumped in the background
+        self.java_flags = list(JAVA_RUN_FLAGS)
+        if shutil.which('java'):
+            threading.Thread(target=self._prepare_java_cds, daemon=True).start()
         
         # Language-specific configurations
         self.language_config = {
@@ -77,6 +686,21 @@ class MCPCodeExecutor:
                 'interpreter': False
             }
         }
+        
+        # The language summary never changes after start-up, so build it once
+        self._language_info = {
+            'supported_languages': self.supported_languages,
+            'timeout': self.timeout,
+            'language_details': {
+                lang: {
+                    'extension': config['extension'],
+                    'compiled': not config['interpreter'],
+                    'interpreter': config['interpreter']
+                }
+                for lang, config in self.language_config.items()
+                if lang != 'c++'  # Exclude duplicate c++
+            }
+        }
     
     def execute_code(self, code: str, language: str, input_data: str = "") -> Dict[str, Any]:
         """
@@ -96,8 +720,9 @@ class MCPCodeExecutor:
             - language (str): Language used
         """
         language = language.lower()
+        runner = self._dispatch.get(language)
         
-        if language not in self.supported_languages:
+        if runner is None:
             return {
                 'success': False,
                 'output': '',
@@ -110,19 +735,14 @@ class MCPCodeExecutor:
         if language == 'c++':
             language = 'cpp'
         
-        start_time = time.time()
+        start_time = time.perf_counter()
+        
+        # Encode the input once; every runner writes these bytes straight to stdin
+        input_bytes = input_data.encode() if input_data else b''
         
         try:
-            if language == 'python':
-                result = self._execute_python(code, input_data)
-            elif language == 'java':
-                result = self._execute_java(code, input_data)
-            elif language == 'javascript':
-                result = self._execute_javascript(code, input_data)
-            elif language == 'cpp':
-                result = self._execute_cpp(code, input_data)
-            
-            result['execution_time'] = time.time() - start_time
+            result = runner(code, input_bytes)
+            result['execution_time'] = time.perf_counter() - start_time
             result['language'] = language
             return result
             
@@ -131,151 +751,272 @@ class MCPCodeExecutor:
                 'success': False,
                 'output': '',
                 'error': f'Execution error: {str(e)}',
-                'execution_time': time.time() - start_time,
+                'execution_time': time.perf_counter() - start_time,
                 'language': language
             }
     
-    def _execute_python(self, code: str, input_data: str) -> Dict[str, Any]:
+    def _prepare_java_cds(self):
+        cds_root = private_dir('mcp_java_cds')
+        archive = build_java_cds_archive(cds_root, max(self.timeout, 60))
+        if archive:
+            # -Xshare:auto falls back to normal class loading if the archive is unusable
+            self.java_flags = [*JAVA_RUN_FLAGS, '-Xshare:auto', f'-XX:SharedArchiveFile={archive}']
+    
+    def _scratch_file(self, code: str, extension: str) -> str:
+        """Write code to a uniquely named file in the scratch directory"""
+        path = os.path.join(self.scratch_dir, f"prog_{uuid.uuid4().hex}{extension}")
+        write_source(path, code)
+        return path
+    
+    def _schedule_sweep(self, interval: float = 60.0, max_age: float = 300.0):
+        """Remove scratch files older than max_age every interval seconds"""
+        def sweep():
+            cutoff = time.time() - max_age
+            try:
+                with os.scandir(self.scratch_dir) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.stat().st_mtime < cutoff:
+                                os.unlink(entry.path)
+                        except OSError:
+                            pass
+            except OSError:
+                return  # scratch directory is gone; stop sweeping
+            self._schedule_sweep(interval, max_age)
+        
+        timer = threading.Timer(interval, sweep)
+        timer.daemon = True
+        timer.start()
+    
+    def _execute_python(self, code: str, input_bytes: bytes) -> Dict[str, Any]:
         """Execute Python code"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            py_file = os.path.join(temp_dir, 'program.py')
-            
-            with open(py_file, 'w') as f:
-                f.write(code)
-            
+        # exec() has no stdin to feed, so programs that read input use a worker
+        if self.inprocess_python and not input_bytes and not INPROCESS_DENYLIST.search(code):
+            return self._execute_python_inprocess(code)
+        
+        py_file = self._scratch_file(code, '.py')
+        try:
             logger.info("=== CODE TO EXECUTE ===\n%s\n=======================", code)  
             
-            result = subprocess.run(
-                ['python', py_file],
-                input=input_data,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout
-            )
+            proc = self.python_pool.acquire()
+            # The script path line fits in the empty pipe, so this never blocks
+            os.write(proc.stdin.fileno(), os.fsencode(py_file) + b'\n')
+            try:
+                stdout, stderr = communicate_bounded(proc, input_bytes, self.timeout)
+            except subprocess.TimeoutExpired:
+                # The worker's argv is the bootstrap source, which means nothing to the caller
+                return {
+                    'success': False,
+                    'output': '',
+                    'error': f'Execution timed out after {self.timeout} seconds'
+                }
             
             return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr
+                'success': proc.returncode == 0,
+                'output': stdout,
+                # Scratch paths are random; the plain name keeps repeated errors identical
+                'error': stderr.replace(py_file, 'program.py')
             }
+        finally:
+            os.unlink(py_file)
     
-    def _execute_java(self, code: str, input_data: str) -> Dict[str, Any]:
-        """Execute Java code"""
-        # Extract class name or use default
-        class_name = self._extract_java_class_name(code) or 'Main'
+    def _execute_python_inprocess(self, code: str) -> Dict[str, Any]:
+        """Execute Python code with exec() in a thread of the server process"""
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        outcome = {'success': False}
         
-        # If no public class is defined, wrap code in a Main class
-        if 'public class' not in code:
-            code = f"public class {class_name} {{\n    public static void main(String[] args) {{\n{self._indent_code(code, 8)}\n    }}\n}}"
+        def run():
+            try:
+                snippet = compile_snippet(code)
+            except (SyntaxError, ValueError) as e:
+                traceback.print_exception(type(e), e, None, file=stderr)
+                return
+            # A copy, so a snippet rebinding a builtin cannot change the server's
+            namespace = {'__name__': '__main__', '__builtins__': dict(vars(builtins))}
+            try:
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                    exec(snippet, namespace)
+                outcome['success'] = True
+            except SystemExit as e:
+                outcome['success'] = e.code in (None, 0)
+            except BaseException as e:
+                traceback.print_exception(type(e), e, e.__traceback__.tb_next, file=stderr)
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            java_file = os.path.join(temp_dir, f'{class_name}.java')
-            
-            with open(java_file, 'w') as f:
-                f.write(code)
-            
-            # Compile
-            compile_result = subprocess.run(
-                ['javac', java_file],
-                capture_output=True,
-                text=True,
-                timeout=self.timeout
-            )
-            
-            if compile_result.returncode != 0:
+        # redirect_stdout swaps the process-wide sys.stdout, so runs are serialized
+        with self._inprocess_lock:
+            saved_streams = sys.stdout, sys.stderr
+            worker = threading.Thread(target=run, daemon=True)
+            worker.start()
+            worker.join(self.timeout)
+            if worker.is_alive():
+                # The thread cannot be stopped, so take the real streams back
+                # and send every later snippet to a subprocess instead.
+                sys.stdout, sys.stderr = saved_streams
+                self.inprocess_python = False
+                logger.error("In-process snippet timed out; falling back to subprocess execution")
                 return {
                     'success': False,
-                    'output': '',
-                    'error': f'Compilation error: {compile_result.stderr}'
+                    'output': stdout.getvalue(),
+                    'error': f'Execution timed out after {self.timeout} seconds'
                 }
+        
+        return {
+            'success': outcome['success'],
+            'output': stdout.getvalue(),
+            'error': stderr.getvalue()
+        }
+    
+    def _execute_java(self, code: str, input_bytes: bytes) -> Dict[str, Any]:
+        """Execute Java code"""
+        class_name, code = self._prepare_java(code)
+        
+        def build(build_dir: str) -> Optional[str]:
+            java_file = os.path.join(build_dir, f'{class_name}.java')
+            
+            write_source(java_file, code)
             
-            # Run
-            run_result = subprocess.run(
-                ['java', '-cp', temp_dir, class_name],
-                input=input_data,
+            compile_result = subprocess.run(
+                [resolve_command('javac'), java_file],
                 capture_output=True,
                 text=True,
-                timeout=self.timeout
+                timeout=self.timeout,
+                close_fds=False
             )
             
+            if compile_result.returncode != 0:
+                stderr = compile_result.stderr.replace(java_file, f'{class_name}.java')
+                return f'Compilation error: {stderr}'
+            return None
+        
+        # Compile, or reuse the classes from an earlier identical request
+        key = self.compile_cache.key(code, toolchain_version('javac'))
+        class_dir, error = self.compile_cache.get_or_build(key, build)
+        if error is not None:
             return {
-                'success': run_result.returncode == 0,
-                'output': run_result.stdout,
-                'error': run_result.stderr
+                'success': False,
+                'output': '',
+                'error': error
             }
+        
+        # Run
+        return run_bounded(
+            [resolve_command('java'), *self.java_flags, '-cp', class_dir, class_name],
+            input_bytes,
+            self.timeout,
+            self.runtime_limits
+        )
     
-    def _execute_javascript(self, code: str, input_data: str) -> Dict[str, Any]:
+    def _execute_javascript(self, code: str, input_bytes: bytes) -> Dict[str, Any]:
         """Execute JavaScript code using Node.js"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            js_file = os.path.join(temp_dir, 'program.js')
+        js_file = self._scratch_file(code, '.js')
+        try:
+            result = run_bounded(
+                [resolve_command('node'), js_file],
+                input_bytes,
+                self.timeout,
+                self.runtime_limits
+            )
+            result['error'] = result['error'].replace(js_file, 'program.js')
+            return result
+        finally:
+            os.unlink(js_file)
+    
+    def _execute_cpp(self, code: str, input_bytes: bytes) -> Dict[str, Any]:
+        """Execute C++ code"""
+        def build(build_dir: str) -> Optional[str]:
+            cpp_file = os.path.join(build_dir, 'program.cpp')
+            exe_file = os.path.join(build_dir, 'program')
             
-            with open(js_file, 'w') as f:
-                f.write(code)
+            write_source(cpp_file, code)
             
-            result = subprocess.run(
-                ['node', js_file],
-                input=input_data,
+            compile_result = subprocess.run(
+                [*CPP_COMPILER, *CPP_COMPILE_FLAGS, '-o', exe_file, cpp_file],
                 capture_output=True,
                 text=True,
-                timeout=self.timeout
+                timeout=self.timeout,
+                close_fds=False
             )
             
+            if compile_result.returncode != 0:
+                stderr = compile_result.stderr.replace(cpp_file, 'program.cpp')
+                return f'Compilation error: {stderr}'
+            return None
+        
+        # Compile, or reuse the binary from an earlier identical request
+        key = self.compile_cache.key(code, ' '.join([toolchain_version('g++'), *CPP_COMPILE_FLAGS]))
+        build_dir, error = self.compile_cache.get_or_build(key, build)
+        if error is not None:
             return {
-                'success': result.returncode == 0,
-                'output': result.stdout,
-                'error': result.stderr
+                'success': False,
+                'output': '',
+                'error': error
             }
+        
+        # Run
+        return run_bounded(
+            [os.path.join(build_dir, 'program')],
+            input_bytes,
+            self.timeout,
+            self.program_limits
+        )
     
-    def _execute_cpp(self, code: str, input_data: str) -> Dict[str, Any]:
-        """Execute C++ code"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            cpp_file = os.path.join(temp_dir, 'program.cpp')
-            exe_file = os.path.join(temp_dir, 'program')
+    def _prepare_java(self, code: str) -> Tuple[str, str]:
+        """Return the class name and full source for a Java snippet"""
+        # Extract class name or use default
+        class_name = self._extract_java_class_name(code) or 'Main'
+        
+        # If no public class is defined, wrap code in a Main class
+        if not _HAS_PUBLIC_CLASS(code):
+            code = JAVA_MAIN_TEMPLATE.format(class_name=class_name, code=code)
+        return class_name, code
+    
+    def _compile_only_java(self, code: str) -> Optional[str]:
+        """Compile Java code without running it; returns the error, if any"""
+        class_name, code = self._prepare_java(code)
+        
+        with tempfile.TemporaryDirectory(dir=SCRATCH_DIR) as temp_dir:
+            java_file = os.path.join(temp_dir, f'{class_name}.java')
             
-            with open(cpp_file, 'w') as f:
-                f.write(code)
+            write_source(java_file, code)
             
-            # Compile
             compile_result = subprocess.run(
-                ['g++', '-o', exe_file, cpp_file],
+                [resolve_command('javac'), '-d', temp_dir, java_file],
                 capture_output=True,
                 text=True,
-                timeout=self.timeout
+                timeout=self.timeout,
+                close_fds=False
             )
             
             if compile_result.returncode != 0:
-                return {
-                    'success': False,
-                    'output': '',
-                    'error': f'Compilation error: {compile_result.stderr}'
-                }
-            
-            # Run
-            run_result = subprocess.run(
-                [exe_file],
-                input=input_data,
+                stderr = compile_result.stderr.replace(java_file, f'{class_name}.java')
+                return f'Compilation error: {stderr}'
+            return None
+    
+    def _compile_only_cpp(self, code: str) -> Optional[str]:
+        """Check C++ code with g++ -fsyntax-only; returns the error, if any"""
+        cpp_file = self._scratch_file(code, '.cpp')
+        try:
+            compile_result = subprocess.run(
+                [*CPP_COMPILER, '-fsyntax-only', cpp_file],
                 capture_output=True,
                 text=True,
-                timeout=self.timeout
+                timeout=self.timeout,
+                close_fds=False
             )
             
-            return {
-                'success': run_result.returncode == 0,
-                'output': run_result.stdout,
-                'error': run_result.stderr
-            }
+            if compile_result.returncode != 0:
+                stderr = compile_result.stderr.replace(cpp_file, 'program.cpp')
+                return f'Compilation error: {stderr}'
+            return None
+        finally:
+            os.unlink(cpp_file)
     
     def _extract_java_class_name(self, code: str) -> Optional[str]:
         """Extract the public class name from Java code"""
-        import re
-        match = re.search(r'public\s+class\s+(\w+)', code)
+        match = _JAVA_CLASS_RE.search(code)
         return match.group(1) if match else None
     
-    def _indent_code(self, code: str, spaces: int) -> str:
-        """Indent code by specified number of spaces"""
-        indent = ' ' * spaces
-        return '\n'.join(indent + line if line.strip() else line for line in code.split('\n'))
-    
     def batch_execute(self, code_snippets: list) -> Dict[str, Any]:
         """
         Execute multiple code snippets
@@ -286,53 +1027,52 @@ class MCPCodeExecutor:
         Returns:
             Dict with execution results for each snippet
         """
-        results = {}
-        
-        for i, snippet in enumerate(code_snippets):
+        def run_one(snippet) -> Dict[str, Any]:
             if not isinstance(snippet, dict) or 'code' not in snippet or 'language' not in snippet:
-                results[f'snippet_{i}'] = {
+                return {
                     'success': False,
                     'output': '',
                     'error': 'Invalid snippet format. Required keys: code, language',
                     'execution_time': 0.0,
                     'language': 'unknown'
                 }
-                continue
             
             code = snippet['code']
             language = snippet['language']
             input_data = snippet.get('input', '')
             
-            results[f'snippet_{i}'] = self.execute_code(code, language, input_data)
+            return self.execute_code(code, language, input_data)
+        
+        if not code_snippets:
+            return {}
         
-        return results
+        # Snippets spend their time waiting on child processes, so threads overlap them
+        max_workers = min(len(code_snippets), (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            outcomes = list(pool.map(run_one, code_snippets))
+        
+        return {f'snippet_{i}': outcome for i, outcome in enumerate(outcomes)}
     
     def get_language_info(self) -> Dict[str, Any]:
         """Get information about supported languages"""
-        return {
-            'supported_languages': self.supported_languages,
-            'timeout': self.timeout,
-            'language_details': {
-                lang: {
-                    'extension': config['extension'],
-                    'compiled': not config['interpreter'],
-                    'interpreter': config['interpreter']
-                }
-                for lang, config in self.language_config.items()
-                if lang != 'c++'  # Exclude duplicate c++
-            }
-        }
+        return self._language_info
 
-# Create global executor instance
-executor = MCPCodeExecutor(timeout=15)
+# Create global executor instance. MCP_INPROCESS_PYTHON=1 turns on in-process
+# Python execution; only set it when every client sends trusted code.
+executor = MCPCodeExecutor(
+    timeout=15,
+    inprocess_python=os.environ.get('MCP_INPROCESS_PYTHON') == '1'
+)
 
+# Tools that run programs hand the blocking executor to a worker thread, so the
+# event loop keeps serving other requests while a program runs.
 @mcp.tool()
-def execute_code(code: str, language: str, input_data: str = "") -> dict:
+async def execute_code(code: str, language: str, input_data: str = "") -> dict:
     """Execute code in the specified programming language (python, java, javascript, cpp, c++)"""
     logger.info(f"Executing {language} code")
     
     try:
-        result = executor.execute_code(code, language, input_data)
+        result = await asyncio.to_thread(executor.execute_code, code, language, input_data)
         
         if result['success']:
             logger.info(f"Code executed successfully in {result['execution_time']:.3f}s")
@@ -354,7 +1094,7 @@ def execute_code(code: str, language: str, input_data: str = "") -> dict:
 
 # Temporarily comment out batch_execute_code if still having issues
 # @mcp.tool()
-# def batch_execute_code(code_snippets: List[CodeSnippet]) -> dict:
+# async def batch_execute_code(code_snippets: List[CodeSnippet]) -> dict:
 #     """Execute multiple code snippets. Each snippet should be a dict with 'code', 'language', and optional 'input' keys"""
 #     logger.info(f"Batch executing {len(code_snippets)} code snippets")
 #     
@@ -368,7 +1108,7 @@ def execute_code(code: str, language: str, input_data: str = "") -> dict:
 #                 'input': snippet.input
 #             })
 #         
-#         results = executor.batch_execute(snippets_dict)
+#         results = await asyncio.to_thread(executor.batch_execute, snippets_dict)
 #         
 #         successful = sum(1 for result in results.values() if result['success'])
 #         logger.info(f"Batch execution completed: {successful}/{len(results)} successful")
@@ -409,7 +1149,7 @@ def get_supported_languages() -> dict:
         return {'error': error_msg}
 
 @mcp.tool()
-def validate_syntax(code: str, language: str) -> dict:
+async def validate_syntax(code: str, language: str) -> dict:
     """Validate code syntax without executing (for compiled languages like Java and C++)"""
     logger.info(f"Validating {language} syntax")
     
@@ -434,11 +1174,11 @@ def validate_syntax(code: str, language: str) -> dict:
         
         # For compiled languages, try compilation only
         if language == 'java':
-            result = executor._execute_java(code, "")
-            if 'Compilation error' in result.get('error', ''):
+            error = await asyncio.to_thread(executor._compile_only_java, code)
+            if error is not None:
                 return {
                     'valid': False,
-                    'error': result['error'],
+                    'error': error,
                     'language': language
                 }
             else:
@@ -449,33 +1189,20 @@ def validate_syntax(code: str, language: str) -> dict:
                 }
         
         elif language == 'cpp':
-            # Try compilation only for C++
-            with tempfile.TemporaryDirectory() as temp_dir:
-                cpp_file = os.path.join(temp_dir, 'program.cpp')
-                exe_file = os.path.join(temp_dir, 'program')
-                
-                with open(cpp_file, 'w') as f:
-                    f.write(code)
-                
-                compile_result = subprocess.run(
-                    ['g++', '-o', exe_file, cpp_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=executor.timeout
-                )
-                
-                if compile_result.returncode != 0:
-                    return {
-                        'valid': False,
-                        'error': f'Compilation error: {compile_result.stderr}',
-                        'language': language
-                    }
-                else:
-                    return {
-                        'valid': True,
-                        'message': 'C++ code compiled successfully',
-                        'language': language
-                    }
+            # Parse and type-check only; skips code generation and linking
+            error = await asyncio.to_thread(executor._compile_only_cpp, code)
+            if error is not None:
+                return {
+                    'valid': False,
+                    'error': error,
+                    'language': language
+                }
+            else:
+                return {
+                    'valid': True,
+                    'message': 'C++ code compiled successfully',
+                    'language': language
+                }
         
     except Exception as e:
         error_msg = f"Syntax validation error: {str(e)}"
@@ -486,13 +1213,8 @@ def validate_syntax(code: str, language: str) -> dict:
             'language': language
         }
 
-@mcp.resource("code-execution://{language}")
-def get_code_execution_resource(language: str) -> str:
-    """Get code execution examples and templates for a specific language"""
-    language = language.lower()
-    
-    templates = {
-        'python': '''# Python Code Template
+_TEMPLATES = {
+    'python': '''# Python Code Template
 print("Hello, World!")
 
 # Input/Output example
@@ -504,7 +1226,7 @@ numbers = [1, 2, 3, 4, 5]
 squared = [n**2 for n in numbers]
 print("Squared numbers:", squared)
 ''',
-        'java': '''// Java Code Template
+    'java': '''// Java Code Template
 import java.util.Scanner;
 
 public class Main {
@@ -529,7 +1251,7 @@ public class Main {
     }
 }
 ''',
-        'javascript': '''// JavaScript (Node.js) Code Template
+    'javascript': '''// JavaScript (Node.js) Code Template
 const readline = require('readline');
 
 console.log("Hello, World!");
@@ -551,7 +1273,7 @@ rl.question('Enter your name: ', (name) => {
     rl.close();
 });
 ''',
-        'cpp': '''// C++ Code Template
+    'cpp': '''// C++ Code Template
 #include <iostream>
 #include <vector>
 #include <string>
@@ -577,7 +1299,7 @@ int main() {
     return 0;
 }
 ''',
-        'c++': '''// C++ Code Template
+    'c++': '''// C++ Code Template
 #include <iostream>
 #include <vector>
 #include <string>
@@ -603,14 +1325,29 @@ int main() {
     return 0;
 }
 '''
-    }
-    
-    if language not in templates:
-        return f"Error: Unsupported language '{language}'. Supported languages: {', '.join(templates.keys())}"
-    
-    return f"""Code Execution Template for {language.upper()}
+}
 
-{templates[language]}
+_TASK_CONTEXTS = {
+    "basic": "Write a simple program that demonstrates basic syntax",
+    "input": "Create a program that reads user input and processes it",
+    "algorithm": "Implement a common algorithm or data structure",
+    "file": "Work with file I/O operations",
+    "debug": "Debug and fix issues in existing code"
+}
+
+_LANGUAGE_TIPS = {
+    "python": "Use clear, readable syntax. Remember Python is indentation-sensitive.",
+    "java": "Define a public class with main method. Handle Scanner properly.",
+    "javascript": "Use Node.js APIs for I/O. Handle asynchronous operations carefully.",
+    "cpp": "Include necessary headers. Use proper memory management.",
+    "c++": "Include necessary headers. Use proper memory management."
+}
+
+# Full resource text per language, including the usage instructions
+_RESOURCES = {
+    language: f"""Code Execution Template for {language.upper()}
+
+{template}
 
 Usage Instructions:
 1. Use the execute_code tool with your code
@@ -626,29 +1363,25 @@ Example tool call:
     "input_data": "optional input data"
 }}
 """
+    for language, template in _TEMPLATES.items()
+}
+
+@mcp.resource("code-execution://{language}")
+def get_code_execution_resource(language: str) -> str:
+    """Get code execution examples and templates for a specific language"""
+    language = language.lower()
+    
+    if language not in _RESOURCES:
+        return f"Error: Unsupported language '{language}'. Supported languages: {', '.join(_RESOURCES.keys())}"
+    
+    return _RESOURCES[language]
 
 @mcp.prompt()
 def code_execution_help(language: str = "general", task: str = "basic") -> str:
     """Generate a code execution help prompt for specific language and task"""
     
-    task_contexts = {
-        "basic": "Write a simple program that demonstrates basic syntax",
-        "input": "Create a program that reads user input and processes it",
-        "algorithm": "Implement a common algorithm or data structure",
-        "file": "Work with file I/O operations",
-        "debug": "Debug and fix issues in existing code"
-    }
-    
-    language_tips = {
-        "python": "Use clear, readable syntax. Remember Python is indentation-sensitive.",
-        "java": "Define a public class with main method. Handle Scanner properly.",
-        "javascript": "Use Node.js APIs for I/O. Handle asynchronous operations carefully.",
-        "cpp": "Include necessary headers. Use proper memory management.",
-        "c++": "Include necessary headers. Use proper memory management."
-    }
-    
-    task_desc = task_contexts.get(task, task_contexts['basic'])
-    lang_tip = language_tips.get(language.lower(), "Follow language best practices.")
+    task_desc = _TASK_CONTEXTS.get(task, _TASK_CONTEXTS['basic'])
+    lang_tip = _LANGUAGE_TIPS.get(language.lower(), "Follow language best practices.")
     
     if language == "general":
         return f"""Code Execution Assistant